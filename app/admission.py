@@ -0,0 +1,204 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Optional
+
+from app.config import AdmissionConfig
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of being admitted."""
+
+
+class AdmissionController:
+    """Bounded-queue admission control with an AIMD concurrency limit.
+
+    Requests are admitted while fewer than ``limit`` are in flight; the rest
+    wait in a bounded FIFO queue. A request is rejected when the time left
+    before its deadline is shorter than the service time, when the queue is
+    full, when its estimated queueing plus service time would overrun the
+    deadline, and again after queueing. Overload therefore turns into
+    rejections rather than unbounded latency. The service time used is the
+    mean latency plus four mean deviations, so most admitted requests finish
+    within their deadline and not just the average one.
+
+    The limit grows additively while service latency stays under the target
+    and the limit is actually being used, and shrinks multiplicatively when
+    latency exceeds the target. All state is touched only from the event
+    loop, so no locking is needed.
+    """
+
+    _EWMA_ALPHA = 0.2
+
+    def __init__(self, name: str, config: AdmissionConfig):
+        self.name = name
+        self._config = config
+        self._limit = float(config.initial_limit)
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._latency = config.latency_target / 2
+        self._latency_dev = 0.0
+        self._last_decrease = 0.0
+        self._last_completion = time.monotonic()
+        self._last_probe = 0.0
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently admitted."""
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """Number of requests waiting for a slot."""
+        return len(self._waiters)
+
+    def deadline_for(self, budget_ms: Optional[int], arrived_at: Optional[float] = None) -> float:
+        """Convert a client time budget in milliseconds to a monotonic deadline.
+
+        The budget counts from ``arrived_at`` when given, so time spent reading
+        and validating the request is charged against it.
+        """
+        if budget_ms is None:
+            budget = self._config.default_deadline
+        else:
+            budget = min(budget_ms / 1000.0, self._config.max_deadline)
+        start = arrived_at if arrived_at is not None else time.monotonic()
+        return start + budget
+
+    @asynccontextmanager
+    async def admit(self, deadline: float, record: bool = True) -> AsyncIterator[float]:
+        """Hold a concurrency slot for the body; yields the seconds left to the deadline.
+
+        With ``record`` false the body's latency is left out of the latency
+        estimate and the limit, for requests known to run slower than usual.
+        """
+        await self._acquire(deadline)
+        start = time.monotonic()
+        try:
+            yield max(deadline - start, 0.0)
+        finally:
+            if record:
+                self._record(time.monotonic() - start)
+            self._release()
+
+    async def _acquire(self, deadline: float) -> None:
+        """Take a slot now, queue for one, or raise AdmissionRejected."""
+        now = time.monotonic()
+        remaining = deadline - now
+        if remaining <= 0:
+            raise AdmissionRejected(f"{self.name}: deadline already expired")
+
+        if remaining < self._service_time():
+            if not self._probe_allowed(now):
+                raise AdmissionRejected(f"{self.name}: deadline cannot be met")
+            self._last_probe = now
+
+        if not self._waiters and self._in_flight < self.limit:
+            self._in_flight += 1
+            return
+
+        if len(self._waiters) >= self._config.max_queue:
+            raise AdmissionRejected(f"{self.name}: queue full")
+
+        if self._estimated_wait() + self._service_time() > remaining:
+            raise AdmissionRejected(f"{self.name}: deadline cannot be met")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, remaining)
+        except asyncio.TimeoutError:
+            self._abandon(waiter)
+            raise AdmissionRejected(f"{self.name}: deadline expired while queued")
+        except BaseException:
+            self._abandon(waiter)
+            raise
+
+        # Queueing may have used up the budget the service time needs.
+        if deadline - time.monotonic() < self._service_time():
+            self._release()
+            raise AdmissionRejected(f"{self.name}: deadline cannot be met after queueing")
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        """Drop a waiter, giving back its slot if one was granted concurrently."""
+        if waiter.done() and not waiter.cancelled():
+            self._release()
+        else:
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+
+    def _probe_allowed(self, now: float) -> bool:
+        """Allow one probe per stale period when idle.
+
+        Estimates only change on completions, so without probes a single slow
+        spell could leave every short-deadline request rejected for good. The
+        stale period runs from the later of the last completion and the last
+        probe, and lasts at least ``probe_interval``.
+        """
+        last_activity = max(self._last_completion, self._last_probe)
+        stale_after = max(self._service_time(), self._config.probe_interval)
+        return self._in_flight == 0 and now - last_activity > stale_after
+
+    def _service_time(self) -> float:
+        """Conservative service time: mean latency plus four deviations, as in TCP RTO."""
+        return self._latency + 4 * self._latency_dev
+
+    def _estimated_wait(self) -> float:
+        """Estimate how long a newly queued request would wait for a slot.
+
+        Uses the conservative service time so that requests which would only
+        be turned away after queueing are rejected up front instead.
+        """
+        ahead = len(self._waiters) + 1
+        return ahead * self._service_time() / max(self.limit, 1)
+
+    def _release(self) -> None:
+        """Free a slot and hand slots to queued requests while under the limit."""
+        self._in_flight -= 1
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self._in_flight += 1
+            waiter.set_result(None)
+
+    def _record(self, latency: float) -> None:
+        """Update the latency estimate and adapt the concurrency limit."""
+        self._last_completion = time.monotonic()
+        error = latency - self._latency
+        self._latency += self._EWMA_ALPHA * error
+        self._latency_dev += self._EWMA_ALPHA * (abs(error) - self._latency_dev)
+        config = self._config
+
+        if latency > config.latency_target:
+            now = time.monotonic()
+            # Back off at most once per observed latency so a burst of slow
+            # completions from the same overload does not collapse the limit.
+            if now - self._last_decrease >= self._latency:
+                self._limit = max(config.min_limit, self._limit * config.backoff_ratio)
+                self._last_decrease = now
+        elif self._in_flight >= self.limit:
+            self._limit = min(config.max_limit, self._limit + 1.0 / self._limit)
+
+
+class ArrivalTimeMiddleware:
+    """ASGI middleware recording when each request reached the application.
+
+    The monotonic arrival time is stored as ``request.state.arrived_at``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            scope.setdefault("state", {})["arrived_at"] = time.monotonic()
+        await self.app(scope, receive, send)
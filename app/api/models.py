@@ -28,6 +28,14 @@ class HealthResponse(BaseModel):
     status: str
 
 
+class ProfileSummary(BaseModel):
+    """Metadata for a captured request profile."""
+    id: int
+    route: str
+    created_at: float
+    duration_ms: float
+
+
 class ErrorResponse(BaseModel):
     """Error response."""
     error: str
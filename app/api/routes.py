@@ -1,49 +1,114 @@
-from fastapi import APIRouter, HTTPException, Depends
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Header, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from app.api.models import (
     GenerateRequest,
     GenerateResponse,
     VerifyRequest,
     VerifyResponse,
-    HealthResponse
+    HealthResponse,
+    ProfileSummary
 )
-from app.generator.service import NameGenerator
-from app.verifier.service import NameVerifier
-from app.store.memory import NameStore
-from app.security import sanitize_input
+from app.generator.service import NameGenerator, GenerationTimeout
+from app.verifier.service import NameVerifier, build_target_profile
+from app.store.memory import NameStore, TargetStore
+from app.store.sessions import SessionStore
+from app.admission import AdmissionController, AdmissionRejected
+from app.profiling import ProfileRecorder
+from app.security import sanitize_input, is_admin_token
 from app.logging_config import logger
+from app import config
 
 router = APIRouter()
-_store = NameStore()
+_store = NameStore(build_target_profile)
+_sessions = SessionStore(config.sessions, build_target_profile)
+_verify_admission = AdmissionController("verify", config.verify_admission)
+_generate_admission = AdmissionController("generate", config.generate_admission)
+_profiler = ProfileRecorder(config.profiling)
 
 
-def get_store() -> NameStore:
-    """Dependency to get store instance."""
-    return _store
+# Dependencies on admission-controlled routes are async so that FastAPI runs
+# them on the event loop; plain def dependencies would wait in the threadpool
+# queue before admission control sees the request.
 
+def store_for(session_id: Optional[str]) -> TargetStore:
+    """Get a session's store, or the shared store without a session ID."""
+    if session_id is None:
+        return _store
+    return _sessions.session(session_id)
 
-def get_generator(store: NameStore = Depends(get_store)) -> NameGenerator:
+
+async def get_store(
+    x_session_id: Optional[str] = Header(None, min_length=1, max_length=128)
+) -> TargetStore:
+    """Dependency to get the caller's session store, or the shared store without a session ID."""
+    return store_for(x_session_id)
+
+
+async def get_generator(store: TargetStore = Depends(get_store)) -> NameGenerator:
     """Dependency to get generator instance."""
     return NameGenerator(store)
 
 
-def get_verifier(store: NameStore = Depends(get_store)) -> NameVerifier:
+async def get_verifier(store: TargetStore = Depends(get_store)) -> NameVerifier:
     """Dependency to get verifier instance."""
     return NameVerifier(store)
 
 
+async def get_deadline_budget(
+    x_request_deadline_ms: Optional[int] = Header(None, gt=0)
+) -> Optional[int]:
+    """Dependency to read the client's time budget in milliseconds."""
+    return x_request_deadline_ms
+
+
+async def get_arrival_time(request: Request) -> Optional[float]:
+    """Dependency to get when the request reached the application, if recorded."""
+    return getattr(request.state, "arrived_at", None)
+
+
+async def get_profile_requested(x_profile: Optional[str] = Header(None)) -> bool:
+    """Dependency to check whether an admin asked for this request to be profiled."""
+    return is_admin_token(x_profile)
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Dependency to restrict an endpoint to holders of the admin token."""
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+def _unavailable(route: str, detail: str) -> HTTPException:
+    """Build the 503 returned for shed requests and missed deadlines."""
+    logger.warning(f"{route} request unavailable: {detail}")
+    return HTTPException(
+        status_code=503,
+        detail=detail,
+        headers={"Retry-After": "1"}
+    )
+
+
 @router.post("/generate", response_model=GenerateResponse)
 async def generate_name(
     request: GenerateRequest,
+    budget_ms: Optional[int] = Depends(get_deadline_budget),
+    arrived_at: Optional[float] = Depends(get_arrival_time),
     generator: NameGenerator = Depends(get_generator)
 ):
     """Generate a target name from a prompt."""
+    deadline = _generate_admission.deadline_for(budget_ms, arrived_at)
     try:
         logger.info("Generate request received")
         prompt = sanitize_input(request.prompt)
-        target_name = await generator.generate(prompt)
+        async with _generate_admission.admit(deadline) as remaining:
+            target_name = await generator.generate(prompt, timeout=remaining)
         logger.info("Name generated successfully")
         return GenerateResponse(target_name=target_name)
     
+    except AdmissionRejected as e:
+        raise _unavailable("Generate", f"Service overloaded: {str(e)}")
+    except GenerationTimeout as e:
+        raise _unavailable("Generate", f"Deadline exceeded: {str(e)}")
     except ValueError as e:
         logger.warning(f"Validation error: {str(e)}")
         raise HTTPException(status_code=422, detail=str(e))
@@ -56,15 +121,29 @@ async def generate_name(
 
 
 @router.post("/verify", response_model=VerifyResponse)
-def verify_name(
+async def verify_name(
     request: VerifyRequest,
+    response: Response,
+    budget_ms: Optional[int] = Depends(get_deadline_budget),
+    arrived_at: Optional[float] = Depends(get_arrival_time),
+    profile_requested: bool = Depends(get_profile_requested),
     verifier: NameVerifier = Depends(get_verifier)
 ):
     """Verify a candidate name against the stored target."""
+    deadline = _verify_admission.deadline_for(budget_ms, arrived_at)
+    profile = _profiler.should_profile(profile_requested)
     try:
         logger.info("Verify request received")
         candidate = sanitize_input(request.candidate_name)
-        result = verifier.verify(candidate)
+        # Profiled calls run slower; keep them out of the latency estimate.
+        async with _verify_admission.admit(deadline, record=not profile):
+            result, profile_id = await run_in_threadpool(
+                _profiler.call, "verify", profile, verifier.verify, candidate
+            )
+        if profile_id is not None:
+            response.headers["X-Profile-Id"] = str(profile_id)
+        elif profile_requested:
+            logger.warning("Requested profile skipped: another profile is in progress")
         logger.info(f"Verification complete: match={result.match}, confidence={result.confidence:.2f}")
         return VerifyResponse(
             match=result.match,
@@ -72,14 +151,52 @@ def verify_name(
             reason=result.reason
         )
     
+    except AdmissionRejected as e:
+        raise _unavailable("Verify", f"Service overloaded: {str(e)}")
     except ValueError as e:
         logger.warning(f"Verification error: {str(e)}")
+        if profile_requested:
+            logger.warning("Requested profile discarded: verification failed")
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Unexpected error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
 
 
+@router.get(
+    "/admin/profiles",
+    response_model=List[ProfileSummary],
+    dependencies=[Depends(require_admin)]
+)
+def list_profiles():
+    """List captured request profiles, most recent first."""
+    return [
+        ProfileSummary(
+            id=profile.id,
+            route=profile.route,
+            created_at=profile.created_at,
+            duration_ms=profile.duration_ms
+        )
+        for profile in _profiler.list()
+    ]
+
+
+@router.get("/admin/profiles/{profile_id}", dependencies=[Depends(require_admin)])
+def download_profile(profile_id: int):
+    """Download a captured profile in collapsed-stack format."""
+    profile = _profiler.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    return Response(
+        content=profile.data,
+        media_type="text/plain",
+        headers={
+            "Content-Disposition": f'attachment; filename="{profile.route}-{profile.id}.folded"'
+        }
+    )
+
+
 @router.get("/health", response_model=HealthResponse)
 def health_check():
     """Health check endpoint."""
@@ -1,3 +1,5 @@
+import math
+import os
 from dataclasses import dataclass, field
 from typing import Dict, List, Set
 
@@ -27,3 +29,88 @@ class VerifierConfig:
 
 
 config = VerifierConfig()
+
+
+@dataclass
+class AdmissionConfig:
+    """Configuration for per-route admission control.
+
+    Times are in seconds. The concurrency limit starts at ``initial_limit``
+    and adapts between ``min_limit`` and ``max_limit`` using AIMD on the
+    observed service latency compared to ``latency_target``. When the
+    latency estimate has not been refreshed for ``probe_interval``, one
+    request whose deadline looks too short is admitted as a probe.
+    """
+    
+    initial_limit: int = 8
+    min_limit: int = 1
+    max_limit: int = 32
+    max_queue: int = 64
+    latency_target: float = 0.05
+    backoff_ratio: float = 0.9
+    default_deadline: float = 1.0
+    max_deadline: float = 10.0
+    probe_interval: float = 1.0
+
+
+verify_admission = AdmissionConfig()
+
+generate_admission = AdmissionConfig(
+    initial_limit=4,
+    max_limit=16,
+    max_queue=32,
+    latency_target=5.0,
+    default_deadline=10.0,
+    max_deadline=30.0,
+    probe_interval=10.0
+)
+
+
+def _sample_rate_from_env() -> float:
+    """Read the profiling sample rate from PROFILE_SAMPLE_RATE."""
+    value = os.getenv('PROFILE_SAMPLE_RATE')
+    if not value:
+        return 0.0
+    try:
+        rate = float(value)
+    except ValueError:
+        raise ValueError(f"PROFILE_SAMPLE_RATE must be a number, got {value!r}")
+    if math.isnan(rate):
+        raise ValueError("PROFILE_SAMPLE_RATE must be a number, got NaN")
+    return rate
+
+
+@dataclass
+class ProfilingConfig:
+    """Configuration for on-demand request profiling.
+
+    ``sample_rate`` is the fraction of requests profiled without an explicit
+    admin request, read from PROFILE_SAMPLE_RATE and clamped to [0, 1];
+    0.0 disables sampling. Only the ``max_profiles`` most recent profiles
+    are kept.
+    """
+    
+    sample_rate: float = field(default_factory=_sample_rate_from_env)
+    max_profiles: int = 20
+    
+    def __post_init__(self):
+        self.sample_rate = min(max(self.sample_rate, 0.0), 1.0)
+
+
+profiling = ProfilingConfig()
+
+
+@dataclass
+class SessionStoreConfig:
+    """Configuration for session-scoped target storage.
+
+    Sessions expire after ``ttl`` seconds without use. ``max_bytes`` is an
+    estimated memory budget split evenly across ``stripes`` lock stripes.
+    """
+    
+    stripes: int = 64
+    ttl: float = 3600.0
+    max_bytes: int = 128 * 1024 * 1024
+
+
+sessions = SessionStoreConfig()
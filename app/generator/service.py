@@ -1,22 +1,27 @@
+import asyncio
 import os
-from openai import AsyncOpenAI
-from app.store.memory import NameStore
+from openai import APITimeoutError, AsyncOpenAI
+from app.store.memory import TargetStore
+
+
+class GenerationTimeout(RuntimeError):
+    """Raised when the LLM call does not finish within its timeout."""
 
 
 class NameGenerator:
     """Generates target names from prompts using LLM."""
     
-    def __init__(self, store: NameStore, api_key: str = None):
+    def __init__(self, store: TargetStore, api_key: str = None):
         self._store = store
         api_key = api_key or os.getenv('OPENAI_API_KEY')
         if not api_key:
             raise ValueError("OpenAI API key required")
         self._client = AsyncOpenAI(api_key=api_key)
     
-    async def generate(self, prompt: str) -> str:
+    async def generate(self, prompt: str, timeout: float = 10.0) -> str:
         """Generate a name from prompt and store it."""
         try:
-            response = await self._client.chat.completions.create(
+            request = self._client.chat.completions.create(
                 model="gpt-4",
                 messages=[
                     {
@@ -30,12 +35,17 @@ class NameGenerator:
                 ],
                 max_tokens=50,
                 temperature=0.7,
-                timeout=10.0
+                timeout=timeout
             )
+            # wait_for bounds the whole call including client retries,
+            # which the per-attempt timeout alone does not.
+            response = await asyncio.wait_for(request, timeout)
             
             name = response.choices[0].message.content.strip()
             self._store.set_target(name)
             return name
             
+        except (APITimeoutError, asyncio.TimeoutError) as e:
+            raise GenerationTimeout(f"Name generation timed out after {timeout:.2f}s") from e
         except Exception as e:
             raise RuntimeError(f"Name generation failed: {str(e)}")
@@ -1,5 +1,6 @@
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
+from app.admission import ArrivalTimeMiddleware
 from app.api.routes import router
 from app.api.errors import validation_exception_handler, generic_exception_handler
 
@@ -11,4 +12,5 @@ app = FastAPI(
 
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(Exception, generic_exception_handler)
+app.add_middleware(ArrivalTimeMiddleware)
 app.include_router(router)
@@ -0,0 +1,150 @@
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from types import FrameType
+from typing import Any, Callable, Deque, List, Optional, Tuple
+
+from app.config import ProfilingConfig
+
+
+@dataclass
+class Profile:
+    """A captured profile of a single request."""
+    id: int
+    route: str
+    created_at: float
+    duration_ms: float
+    data: bytes
+
+
+class _StackTracer:
+    """Records self time per call stack for the thread that installs it.
+
+    Installed with ``sys.setprofile``, which only affects the calling thread
+    on every Python version, so calls running on other threads never show up.
+    """
+
+    def __init__(self):
+        self._stack: List[str] = []
+        self._times: Counter = Counter()
+        self._last = time.perf_counter_ns()
+
+    def __call__(self, frame: FrameType, event: str, arg: Any) -> None:
+        now = time.perf_counter_ns()
+        if self._stack:
+            self._times[self._stack[-1]] += now - self._last
+
+        if event == "call":
+            self._push(_frame_label(frame))
+        elif event == "c_call":
+            self._push(_builtin_label(arg))
+        elif event in ("return", "c_return", "c_exception") and self._stack:
+            self._stack.pop()
+        self._last = time.perf_counter_ns()
+
+    def _push(self, label: str) -> None:
+        self._stack.append(f"{self._stack[-1]};{label}" if self._stack else label)
+
+    def collapsed(self) -> bytes:
+        """Return stacks in collapsed format, weighted by nanoseconds of self time."""
+        lines = [f"{stack} {ns}" for stack, ns in sorted(self._times.items()) if ns > 0]
+        return "\n".join(lines).encode() + b"\n"
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _builtin_label(func: Any) -> str:
+    name = getattr(func, "__qualname__", None) or getattr(func, "__name__", repr(func))
+    module = getattr(func, "__module__", None)
+    return f"{module}.{name}" if module else name
+
+
+class ProfileRecorder:
+    """Captures per-request call-stack profiles into a bounded ring.
+
+    Profiles are traced on the thread running the request only and stored in
+    collapsed-stack format: one ``frame;frame;frame weight`` line per stack,
+    weighted by nanoseconds of self time. They open in speedscope and
+    ``flamegraph.pl``. Times include tracing overhead, so compare them with
+    each other rather than with unprofiled latencies. Only one request is
+    profiled at a time; a selected request that arrives while another is
+    being profiled runs unprofiled instead of waiting, and ``call`` reports
+    no profile ID for it.
+    """
+
+    def __init__(self, config: ProfilingConfig):
+        self._sample_rate = config.sample_rate
+        self._profiles: Deque[Profile] = deque(maxlen=config.max_profiles)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._active = threading.Lock()
+
+    def should_profile(self, requested: bool) -> bool:
+        """Decide whether to profile a request."""
+        if requested:
+            return True
+        return self._sample_rate > 0 and random.random() < self._sample_rate
+
+    def call(
+        self,
+        route: str,
+        enabled: bool,
+        func: Callable[..., Any],
+        *args: Any
+    ) -> Tuple[Any, Optional[int]]:
+        """Call func, profiling it when enabled and no other profile is running.
+
+        Returns the result and the ID of the captured profile, or None when
+        the call was not profiled. Profiles of calls that raise are discarded,
+        since the caller never gets their ID.
+        """
+        if not enabled or not self._active.acquire(blocking=False):
+            return func(*args), None
+
+        try:
+            tracer = _StackTracer()
+            previous = sys.getprofile()
+            start = time.perf_counter()
+            profile_id = next(self._ids)
+            sys.setprofile(tracer)
+            try:
+                result = func(*args)
+            finally:
+                sys.setprofile(previous)
+            duration_ms = (time.perf_counter() - start) * 1000
+            self._store(profile_id, route, duration_ms, tracer.collapsed())
+            return result, profile_id
+        finally:
+            self._active.release()
+
+    def list(self) -> List[Profile]:
+        """Return stored profiles, most recent first."""
+        with self._lock:
+            return list(reversed(self._profiles))
+
+    def get(self, profile_id: int) -> Optional[Profile]:
+        """Return a stored profile by ID, if it is still in the ring."""
+        with self._lock:
+            for profile in self._profiles:
+                if profile.id == profile_id:
+                    return profile
+        return None
+
+    def _store(self, profile_id: int, route: str, duration_ms: float, data: bytes) -> None:
+        """Append a profile, evicting the oldest when the ring is full."""
+        with self._lock:
+            self._profiles.append(Profile(
+                id=profile_id,
+                route=route,
+                created_at=time.time(),
+                duration_ms=duration_ms,
+                data=data
+            ))
@@ -1,4 +1,7 @@
+import os
 import re
+import secrets
+from typing import Optional
 
 
 def sanitize_input(text: str) -> str:
@@ -13,3 +16,11 @@ def sanitize_input(text: str) -> str:
     text = re.sub(r'[<>{}\\]', '', text)
     
     return text
+
+
+def is_admin_token(token: Optional[str]) -> bool:
+    """Check a token against ADMIN_TOKEN; always False when it is not configured."""
+    admin_token = os.getenv('ADMIN_TOKEN')
+    if not admin_token or not token:
+        return False
+    return secrets.compare_digest(token.encode(), admin_token.encode())
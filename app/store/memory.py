@@ -1,20 +1,42 @@
-from typing import Optional
+from typing import Optional, Protocol
 from threading import Lock
+from app.store.target_profile import TargetProfile, ProfileBuilder
+
+
+class TargetStore(Protocol):
+    """Interface shared by the global store and per-session stores."""
+    
+    def set_target(self, name: str) -> None: ...
+    
+    def get_target(self) -> Optional[str]: ...
+    
+    def get_profile(self) -> Optional[TargetProfile]: ...
 
 
 class NameStore:
-    """Thread-safe in-memory storage for the current target name."""
+    """Thread-safe in-memory storage for the current target name.
+    
+    The target's profile is computed once by ``profile_builder`` when the
+    target is set, so readers never repeat that work.
+    """
     
-    def __init__(self):
-        self._target_name: Optional[str] = None
+    def __init__(self, profile_builder: ProfileBuilder):
+        self._build_profile = profile_builder
+        self._profile: Optional[TargetProfile] = None
         self._lock = Lock()
     
     def set_target(self, name: str) -> None:
         """Store the current target name, overwriting any previous value."""
+        profile = self._build_profile(name)
         with self._lock:
-            self._target_name = name
+            self._profile = profile
     
     def get_target(self) -> Optional[str]:
         """Retrieve the current target name."""
+        profile = self.get_profile()
+        return profile.name if profile is not None else None
+    
+    def get_profile(self) -> Optional[TargetProfile]:
+        """Retrieve the precomputed profile of the current target name."""
         with self._lock:
-            return self._target_name
+            return self._profile
@@ -0,0 +1,142 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import List, Optional
+from app.config import SessionStoreConfig
+from app.store.target_profile import TargetProfile, ProfileBuilder
+
+# Per-entry cost of the key, entry, profile and token tuple objects, plus
+# the cost of each token string, on top of the string contents counted in
+# _entry_size. Measured with tracemalloc on CPython 3.11; benchmark_sessions.py
+# reports measured against estimated size.
+_ENTRY_OVERHEAD = 448
+_TOKEN_OVERHEAD = 57
+
+
+@dataclass
+class _Entry:
+    """A session's target profile with its expiry time and estimated size."""
+    profile: TargetProfile
+    expires_at: float
+    size: int
+
+
+class _Stripe:
+    """One lock-protected shard of the session map, kept in LRU order."""
+
+    def __init__(self, max_bytes: int):
+        self.lock = Lock()
+        self.entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self.bytes = 0
+        self.max_bytes = max_bytes
+
+
+class SessionStore:
+    """Session-scoped target store with lock striping and TTL/LRU eviction.
+
+    Sessions are spread over independent stripes by hash of the session ID,
+    so requests for unrelated sessions rarely share a lock. Each stripe keeps
+    its entries in least-recently-used order. Reads and writes refresh a
+    session's idle TTL, so expired sessions always sit at the LRU end and are
+    evicted from there, followed by the least recently used live sessions
+    while the stripe is over its share of the memory budget. The entry just
+    written is never evicted by its own write. Target profiles
+    are computed by ``profile_builder`` when a target is set.
+    """
+
+    def __init__(self, config: SessionStoreConfig, profile_builder: ProfileBuilder):
+        self._build_profile = profile_builder
+        self._ttl = config.ttl
+        per_stripe = max(config.max_bytes // config.stripes, 1)
+        self._stripes: List[_Stripe] = [_Stripe(per_stripe) for _ in range(config.stripes)]
+
+    def session(self, session_id: str) -> "SessionNameStore":
+        """Return a store scoped to a single session."""
+        return SessionNameStore(self, session_id)
+
+    def set_target(self, session_id: str, name: str) -> None:
+        """Store a session's target name, overwriting any previous value."""
+        profile = self._build_profile(name)
+        size = _entry_size(session_id, profile)
+        stripe = self._stripe(session_id)
+        now = time.monotonic()
+
+        with stripe.lock:
+            old = stripe.entries.pop(session_id, None)
+            if old is not None:
+                stripe.bytes -= old.size
+            stripe.entries[session_id] = _Entry(profile, now + self._ttl, size)
+            stripe.bytes += size
+            self._evict(stripe, now)
+
+    def get_profile(self, session_id: str) -> Optional[TargetProfile]:
+        """Retrieve a session's target profile, refreshing its TTL."""
+        stripe = self._stripe(session_id)
+        now = time.monotonic()
+
+        with stripe.lock:
+            entry = stripe.entries.get(session_id)
+            if entry is None:
+                return None
+            if entry.expires_at <= now:
+                del stripe.entries[session_id]
+                stripe.bytes -= entry.size
+                return None
+            entry.expires_at = now + self._ttl
+            stripe.entries.move_to_end(session_id)
+            return entry.profile
+
+    def __len__(self) -> int:
+        """Number of stored sessions, including expired ones not yet evicted."""
+        return sum(len(stripe.entries) for stripe in self._stripes)
+
+    def _stripe(self, session_id: str) -> _Stripe:
+        """Pick the stripe that owns a session ID."""
+        return self._stripes[hash(session_id) % len(self._stripes)]
+
+    def _evict(self, stripe: _Stripe, now: float) -> None:
+        """Drop expired entries, then LRU entries while over budget. Caller holds the lock.
+
+        The newest entry is always kept, even when it alone exceeds the
+        stripe's budget, so a target that was just set can still be read.
+        """
+        entries = stripe.entries
+        while len(entries) > 1:
+            session_id, entry = next(iter(entries.items()))
+            if entry.expires_at > now and stripe.bytes <= stripe.max_bytes:
+                break
+            del entries[session_id]
+            stripe.bytes -= entry.size
+
+
+class SessionNameStore:
+    """View of a SessionStore bound to one session, with the NameStore interface."""
+
+    def __init__(self, sessions: SessionStore, session_id: str):
+        self._sessions = sessions
+        self._session_id = session_id
+
+    def set_target(self, name: str) -> None:
+        """Store this session's target name."""
+        self._sessions.set_target(self._session_id, name)
+
+    def get_target(self) -> Optional[str]:
+        """Retrieve this session's target name."""
+        profile = self.get_profile()
+        return profile.name if profile is not None else None
+
+    def get_profile(self) -> Optional[TargetProfile]:
+        """Retrieve the precomputed profile of this session's target name."""
+        return self._sessions.get_profile(self._session_id)
+
+
+def _entry_size(session_id: str, profile: TargetProfile) -> int:
+    """Estimate the memory held by one session entry."""
+    return (
+        _ENTRY_OVERHEAD
+        + _TOKEN_OVERHEAD * len(profile.tokens)
+        + len(session_id)
+        + len(profile.name)
+        + sum(len(token) for token in profile.tokens)
+    )
@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+from typing import Callable, Tuple
+
+
+@dataclass(frozen=True)
+class TargetProfile:
+    """Target name with its normalized tokens, computed once per target."""
+    name: str
+    tokens: Tuple[str, ...]
+
+
+ProfileBuilder = Callable[[str], TargetProfile]
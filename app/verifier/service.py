@@ -1,5 +1,6 @@
 from dataclasses import dataclass
-from app.store.memory import NameStore
+from app.store.memory import TargetStore
+from app.store.target_profile import TargetProfile
 from app.verifier.normalizer import Normalizer
 from app.verifier.tokenizer import Tokenizer
 from app.verifier.matcher import Matcher
@@ -14,10 +15,22 @@ class VerifyResponse:
     reason: str
 
 
+_normalizer = Normalizer()
+_tokenizer = Tokenizer()
+
+
+def build_target_profile(name: str) -> TargetProfile:
+    """Normalize and tokenize a target name for repeated verification."""
+    return TargetProfile(
+        name=name,
+        tokens=tuple(_tokenizer.tokenize(_normalizer.normalize(name)))
+    )
+
+
 class NameVerifier:
     """Verifies candidate names against stored target."""
     
-    def __init__(self, store: NameStore):
+    def __init__(self, store: TargetStore):
         self._store = store
         self._normalizer = Normalizer()
         self._tokenizer = Tokenizer()
@@ -26,17 +39,14 @@ class NameVerifier:
     
     def verify(self, candidate: str) -> VerifyResponse:
         """Verify candidate against stored target name."""
-        target = self._store.get_target()
+        target = self._store.get_profile()
         if target is None:
             raise ValueError("No target name in store")
         
-        target_normalized = self._normalizer.normalize(target)
         candidate_normalized = self._normalizer.normalize(candidate)
-        
-        target_tokens = self._tokenizer.tokenize(target_normalized)
         candidate_tokens = self._tokenizer.tokenize(candidate_normalized)
         
-        metrics = self._matcher.compute_similarity(target_tokens, candidate_tokens)
+        metrics = self._matcher.compute_similarity(list(target.tokens), candidate_tokens)
         confidence = self._scorer.compute_confidence(metrics)
         match = self._scorer.make_decision(confidence, metrics.order_preserved)
         reason = self._scorer.generate_reason(match, confidence, metrics)
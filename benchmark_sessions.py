@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Concurrency benchmark for session-scoped target stores.
+
+Fills a SessionStore with an increasing number of active sessions, then has
+several threads verify candidates against randomly chosen sessions. For each
+session count it reports end-to-end verify throughput and raw store lookup
+throughput, each with its ratio to the 1-session baseline. A lookup only
+touches one stripe and is O(1) in the number of sessions, so neither should
+degrade with lock contention. Verify throughput stays flat within run-to-run
+noise of about 15%, since matching dominates it. Lookup throughput drops by
+a third or more from 10,000 sessions on, by the same amount with one thread
+as with eight. That drop comes from the working set outgrowing the CPU
+caches (about 65 MB at 100,000 sessions), not from lock contention.
+Finally it fills a fresh store under tracemalloc and compares the measured
+memory per session with the estimate the store uses for its budget.
+
+Usage:
+    python benchmark_sessions.py [--threads N] [--duration SECONDS]
+"""
+
+import argparse
+import random
+import threading
+import time
+import tracemalloc
+
+from app.config import SessionStoreConfig
+from app.store.sessions import SessionStore
+from app.verifier.service import NameVerifier, build_target_profile
+
+SESSION_STEPS = [1, 100, 1_000, 10_000, 100_000]
+MEMORY_SAMPLE = 20_000
+TARGETS = ["William Smith", "Ahmed Al-Rashid", "Elizabeth Jones", "Abdul Rahman"]
+CANDIDATES = ["Bill Smith", "Ahmad Al Rashid", "Liz Jones", "Abdul Rahmann"]
+
+
+def run_threads(threads: int, duration: float, work) -> float:
+    """Run work(rng) in a loop on each thread for duration; return total calls per second."""
+    counts = [0] * threads
+    stop = time.monotonic() + duration
+
+    def worker(index: int) -> None:
+        rng = random.Random(index)
+        count = 0
+        while time.monotonic() < stop:
+            work(rng)
+            count += 1
+        counts[index] = count
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return sum(counts) / duration
+
+
+def measure_entry_size(count: int) -> tuple:
+    """Fill a fresh store; return measured and estimated bytes per session."""
+    store = SessionStore(SessionStoreConfig(), build_target_profile)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for i in range(count):
+            store.set_target(f"session-{i}", f"{TARGETS[i % len(TARGETS)]} {i}")
+        measured = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    estimated = sum(stripe.bytes for stripe in store._stripes)
+    return measured / count, estimated / count
+
+
+def main(threads: int, duration: float) -> None:
+    store = SessionStore(SessionStoreConfig(), build_target_profile)
+    session_ids = []
+
+    print(f"{threads} threads, {duration:.0f}s per step\n")
+    print(f"{'sessions':>9} {'verify/s':>10} {'vs 1':>6} {'lookup/s':>11} {'vs 1':>6}")
+    baseline = None
+    for count in SESSION_STEPS:
+        for i in range(len(session_ids), count):
+            session_id = f"session-{i}"
+            store.set_target(session_id, TARGETS[i % len(TARGETS)])
+            session_ids.append(session_id)
+
+        def verify(rng: random.Random) -> None:
+            index = rng.randrange(count)
+            verifier = NameVerifier(store.session(session_ids[index]))
+            verifier.verify(CANDIDATES[index % len(CANDIDATES)])
+
+        def lookup(rng: random.Random) -> None:
+            store.get_profile(session_ids[rng.randrange(count)])
+
+        verify_rate = run_threads(threads, duration, verify)
+        lookup_rate = run_threads(threads, duration, lookup)
+        baseline = baseline or (verify_rate, lookup_rate)
+        print(
+            f"{len(store):>9} {verify_rate:>10.0f} {verify_rate / baseline[0]:>6.2f}"
+            f" {lookup_rate:>11.0f} {lookup_rate / baseline[1]:>6.2f}"
+        )
+
+    measured, estimated = measure_entry_size(MEMORY_SAMPLE)
+    print(f"\nbytes per session: {measured:.0f} measured, {estimated:.0f} estimated")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=3.0)
+    args = parser.parse_args()
+    main(args.threads, args.duration)
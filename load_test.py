@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""Local load test for /verify admission control.
+
+Starts the API in a subprocess with a fixed target name and measures its
+saturation rate by sending /verify requests one at a time. It then offers an
+open-loop request rate from half to three times that rate. For each step it
+reports goodput, the share of requests shed with 503, and latency percentiles
+of admitted and shed requests. With admission control the p99 of admitted
+requests stays bounded while the rejection rate absorbs the excess load.
+
+Usage:
+    python load_test.py [--duration SECONDS] [--deadline-ms MS]
+"""
+
+import argparse
+import asyncio
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+# Long names on both sides exercise the quadratic token loops in Matcher,
+# making each verification CPU-bound for tens of milliseconds.
+TARGET = " ".join(["Rahman Khalid Rashid Mohamed Yusuf Hassan"] * 10)
+CANDIDATE = " ".join(["Abdul Rahman Ibn Khaled Al Rashid Mohammed"] * 10)
+# Offered load as multiples of the measured saturation rate.
+LOAD_FACTORS = [0.5, 1.0, 2.0, 3.0]
+
+
+def serve(port: int) -> None:
+    """Run the API with a fixed target name (subprocess entry point)."""
+    import logging
+    import uvicorn
+    from app.api import routes
+    from app.main import app
+
+    logging.getLogger("name_verification").setLevel(logging.ERROR)
+    routes.store_for(None).set_target(TARGET)
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+
+
+def free_port() -> int:
+    """Pick an unused local port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1)
+    return ordered[max(index, 0)]
+
+
+async def send(http: httpx.AsyncClient, headers, ok, shed, errors) -> None:
+    """Send one /verify request and record its latency by outcome."""
+    start = time.monotonic()
+    try:
+        response = await http.post("/verify", json={"candidate_name": CANDIDATE}, headers=headers)
+    except httpx.HTTPError:
+        errors.append(time.monotonic() - start)
+        return
+    elapsed = time.monotonic() - start
+    if response.status_code == 200:
+        ok.append(elapsed)
+    elif response.status_code == 503:
+        shed.append(elapsed)
+    else:
+        errors.append(elapsed)
+
+
+async def measure_capacity(base_url: str, duration: float) -> float:
+    """Measure the saturation rate by sending /verify requests one at a time."""
+    count = 0
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0) as http:
+        start = time.monotonic()
+        while time.monotonic() - start < duration:
+            await http.post("/verify", json={"candidate_name": CANDIDATE})
+            count += 1
+        return count / (time.monotonic() - start)
+
+
+async def run_step(base_url: str, rate: float, duration: float, deadline_ms: int) -> None:
+    """Offer an open-loop request rate for one step and print its summary line."""
+    ok, shed, errors = [], [], []
+    headers = {"X-Request-Deadline-Ms": str(deadline_ms)}
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as http:
+        tasks = []
+        start = time.monotonic()
+        for i in range(int(rate * duration)):
+            delay = start + i / rate - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(send(http, headers, ok, shed, errors)))
+        await asyncio.gather(*tasks)
+
+    total = len(ok) + len(shed) + len(errors)
+    print(
+        f"{rate:>8.0f} {len(ok) / duration:>9.1f} {100.0 * len(shed) / max(total, 1):>7.1f}% "
+        f"{len(errors):>6} {percentile(ok, 50) * 1000:>9.1f} {percentile(ok, 99) * 1000:>9.1f} "
+        f"{percentile(shed, 50) * 1000:>11.1f} {percentile(shed, 99) * 1000:>11.1f}"
+    )
+
+
+async def main(duration: float, deadline_ms: int) -> None:
+    port = free_port()
+    server = subprocess.Popen([sys.executable, __file__, "--serve", str(port)])
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        async with httpx.AsyncClient(base_url=base_url) as http:
+            for _ in range(100):
+                try:
+                    if (await http.get("/health")).status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    pass
+                await asyncio.sleep(0.1)
+
+        capacity = await measure_capacity(base_url, duration)
+        print(f"Saturation: {capacity:.1f} req/s, deadline budget: {deadline_ms} ms, {duration:.0f}s per step\n")
+        print(f"{'offered':>8} {'ok req/s':>9} {'shed':>8} {'errors':>6} {'p50 ms':>9} {'p99 ms':>9} {'shed p50 ms':>11} {'shed p99 ms':>11}")
+        for factor in LOAD_FACTORS:
+            await run_step(base_url, factor * capacity, duration, deadline_ms)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--deadline-ms", type=int, default=500)
+    parser.add_argument("--serve", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve)
+    else:
+        asyncio.run(main(args.duration, args.deadline_ms))
@@ -2,7 +2,7 @@
 """Manual test script to verify core functionality without API key."""
 
 from app.store.memory import NameStore
-from app.verifier.service import NameVerifier
+from app.verifier.service import NameVerifier, build_target_profile
 
 def test_verification():
     """Test the verification logic."""
@@ -10,7 +10,7 @@ def test_verification():
     print("=" * 50)
     
     # Create store and verifier
-    store = NameStore()
+    store = NameStore(build_target_profile)
     verifier = NameVerifier(store)
     
     # Test 1: Exact match
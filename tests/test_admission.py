@@ -0,0 +1,326 @@
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.admission import AdmissionController, AdmissionRejected
+from app.api import routes
+from app.config import AdmissionConfig
+from app.generator.service import GenerationTimeout
+from app.main import app
+
+
+def make_controller(**overrides) -> AdmissionController:
+    """Build a controller with small, test-friendly settings."""
+    settings = dict(
+        initial_limit=2,
+        min_limit=1,
+        max_limit=8,
+        max_queue=2,
+        latency_target=0.1,
+        default_deadline=1.0,
+        max_deadline=5.0
+    )
+    settings.update(overrides)
+    return AdmissionController("test", AdmissionConfig(**settings))
+
+
+def deadline_in(seconds: float) -> float:
+    return time.monotonic() + seconds
+
+
+async def hold(controller: AdmissionController, release: asyncio.Event, deadline: float = None) -> None:
+    """Hold a slot until release is set."""
+    async with controller.admit(deadline or deadline_in(5.0)):
+        await release.wait()
+
+
+async def settle() -> None:
+    """Let pending tasks run until they block."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestAdmission:
+    """Tests for slot accounting and queueing."""
+
+    async def test_admits_up_to_limit_then_queues(self):
+        controller = make_controller()
+        release = asyncio.Event()
+        holders = [asyncio.create_task(hold(controller, release)) for _ in range(3)]
+        await settle()
+
+        assert controller.in_flight == 2
+        assert controller.queued == 1
+
+        release.set()
+        await asyncio.gather(*holders)
+        assert controller.in_flight == 0
+        assert controller.queued == 0
+
+    async def test_queue_full_is_rejected(self):
+        controller = make_controller()
+        release = asyncio.Event()
+        holders = [asyncio.create_task(hold(controller, release)) for _ in range(4)]
+        await settle()
+
+        with pytest.raises(AdmissionRejected, match="queue full"):
+            async with controller.admit(deadline_in(5.0)):
+                pass
+
+        release.set()
+        await asyncio.gather(*holders)
+        assert controller.in_flight == 0
+
+    async def test_deadline_expires_while_queued(self):
+        controller = make_controller(initial_limit=1, latency_target=0.01)
+        release = asyncio.Event()
+        holder = asyncio.create_task(hold(controller, release))
+        await settle()
+
+        with pytest.raises(AdmissionRejected, match="expired while queued"):
+            async with controller.admit(deadline_in(0.1)):
+                pass
+        assert controller.queued == 0
+
+        release.set()
+        await holder
+        assert controller.in_flight == 0
+
+
+class TestDeadlines:
+    """Tests for deadline-based rejection."""
+
+    async def test_expired_deadline_is_rejected(self):
+        controller = make_controller()
+
+        with pytest.raises(AdmissionRejected, match="already expired"):
+            async with controller.admit(deadline_in(-1.0)):
+                pass
+        assert controller.in_flight == 0
+
+    async def test_deadline_shorter_than_service_time_is_rejected(self):
+        controller = make_controller(latency_target=1.0)
+
+        with pytest.raises(AdmissionRejected, match="cannot be met"):
+            async with controller.admit(deadline_in(0.1)):
+                pass
+        assert controller.in_flight == 0
+
+    async def test_stale_estimate_admits_probe(self):
+        controller = make_controller(latency_target=0.1, probe_interval=0.05)
+        await asyncio.sleep(0.1)
+
+        async with controller.admit(deadline_in(0.01)):
+            assert controller.in_flight == 1
+        assert controller.in_flight == 0
+
+    async def test_only_one_probe_per_stale_period(self):
+        controller = make_controller(latency_target=1.0, probe_interval=0.1)
+        await asyncio.sleep(0.6)
+
+        async with controller.admit(deadline_in(0.01)):
+            with pytest.raises(AdmissionRejected, match="cannot be met"):
+                async with controller.admit(deadline_in(0.01)):
+                    pass
+
+        with pytest.raises(AdmissionRejected, match="cannot be met"):
+            async with controller.admit(deadline_in(0.01)):
+                pass
+
+    async def test_probe_is_allowed_again_after_stale_period(self):
+        controller = make_controller(latency_target=0.2, probe_interval=0.05)
+        await asyncio.sleep(0.15)
+        async with controller.admit(deadline_in(0.01)):
+            pass
+
+        await asyncio.sleep(0.3)
+        async with controller.admit(deadline_in(0.01)):
+            assert controller.in_flight == 1
+
+    def test_budget_is_capped_and_defaulted(self):
+        controller = make_controller(default_deadline=1.0, max_deadline=5.0)
+        now = time.monotonic()
+
+        assert controller.deadline_for(None, now) == pytest.approx(now + 1.0)
+        assert controller.deadline_for(200, now) == pytest.approx(now + 0.2)
+        assert controller.deadline_for(60_000, now) == pytest.approx(now + 5.0)
+
+
+class TestAimd:
+    """Tests for adapting the concurrency limit."""
+
+    async def test_limit_grows_while_saturated_and_fast(self):
+        controller = make_controller(initial_limit=2, latency_target=1.0)
+
+        for _ in range(10):
+            release = asyncio.Event()
+            holders = [
+                asyncio.create_task(hold(controller, release))
+                for _ in range(controller.limit)
+            ]
+            await settle()
+            release.set()
+            await asyncio.gather(*holders)
+
+        assert controller.limit > 2
+
+    async def test_limit_does_not_grow_when_underused(self):
+        controller = make_controller(initial_limit=4, latency_target=1.0)
+
+        for _ in range(10):
+            async with controller.admit(deadline_in(5.0)):
+                pass
+
+        assert controller.limit == 4
+
+    async def test_limit_backs_off_when_slow(self):
+        controller = make_controller(initial_limit=4, latency_target=0.01)
+
+        async with controller.admit(deadline_in(5.0)):
+            await asyncio.sleep(0.05)
+
+        assert controller.limit == 3
+
+    async def test_unrecorded_latency_is_ignored(self):
+        controller = make_controller(initial_limit=4, latency_target=0.01)
+
+        async with controller.admit(deadline_in(5.0), record=False):
+            await asyncio.sleep(0.05)
+
+        assert controller.limit == 4
+        assert controller._service_time() == pytest.approx(0.005)
+
+    async def test_limit_stays_within_bounds(self):
+        controller = make_controller(initial_limit=1, min_limit=1, latency_target=0.01)
+
+        for _ in range(3):
+            await asyncio.sleep(0.05)
+            async with controller.admit(deadline_in(5.0)):
+                await asyncio.sleep(0.02)
+
+        assert controller.limit == 1
+
+
+class TestAbandonedWaiters:
+    """Tests that queued requests never leak or lose slots."""
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        controller = make_controller(initial_limit=1)
+        release = asyncio.Event()
+        holder = asyncio.create_task(hold(controller, release))
+        waiter = asyncio.create_task(hold(controller, release))
+        await settle()
+        assert controller.queued == 1
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert controller.queued == 0
+
+        release.set()
+        await holder
+        assert controller.in_flight == 0
+
+    async def test_granted_slot_is_returned_when_waiter_is_cancelled(self):
+        controller = make_controller(initial_limit=1)
+        release = asyncio.Event()
+        holder = asyncio.create_task(hold(controller, release))
+        await settle()
+
+        async def enter() -> None:
+            async with controller.admit(deadline_in(5.0)):
+                pass
+
+        waiter = asyncio.create_task(enter())
+        await settle()
+
+        # Release grants the slot to the waiter; cancel it before it resumes.
+        release.set()
+        await holder
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+        assert controller.in_flight == 0
+        assert controller.queued == 0
+
+    async def test_release_skips_finished_waiters(self):
+        controller = make_controller(initial_limit=1)
+        release = asyncio.Event()
+        holder = asyncio.create_task(hold(controller, release))
+        waiter = asyncio.create_task(hold(controller, release))
+        await settle()
+
+        stale = asyncio.get_running_loop().create_future()
+        stale.cancel()
+        controller._waiters.appendleft(stale)
+
+        release.set()
+        await asyncio.gather(holder, waiter)
+
+        assert controller.in_flight == 0
+        assert controller.queued == 0
+
+
+class TimingOutGenerator:
+    """Generator stub whose LLM call always runs out of time."""
+
+    async def generate(self, prompt: str, timeout: float = 10.0) -> str:
+        raise GenerationTimeout(f"Name generation timed out after {timeout:.2f}s")
+
+
+class TestAdmissionRoutes:
+    """Tests for how routes report shed requests and missed deadlines."""
+
+    @pytest.fixture
+    def client(self):
+        routes.store_for(None).set_target("William Smith")
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+
+    @pytest.fixture
+    def overloaded(self, monkeypatch):
+        """Replace both controllers with ones whose service time exceeds any budget."""
+        monkeypatch.setattr(routes, "_verify_admission", make_controller(latency_target=100.0))
+        monkeypatch.setattr(routes, "_generate_admission", make_controller(latency_target=100.0))
+
+    def test_shed_verify_returns_503_with_retry_after(self, client, overloaded):
+        response = client.post(
+            "/verify",
+            json={"candidate_name": "William Smith"},
+            headers={"X-Request-Deadline-Ms": "500"}
+        )
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert "overloaded" in response.json()["detail"]
+
+    def test_shed_generate_returns_503_with_retry_after(self, client, overloaded):
+        app.dependency_overrides[routes.get_generator] = TimingOutGenerator
+        response = client.post(
+            "/generate",
+            json={"prompt": "A common English name"},
+            headers={"X-Request-Deadline-Ms": "500"}
+        )
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert "overloaded" in response.json()["detail"]
+
+    @pytest.mark.parametrize("budget", ["0", "-5", "soon"])
+    def test_invalid_deadline_header_is_rejected(self, client, budget):
+        response = client.post(
+            "/verify",
+            json={"candidate_name": "William Smith"},
+            headers={"X-Request-Deadline-Ms": budget}
+        )
+        assert response.status_code == 422
+
+    def test_generation_timeout_returns_503(self, client):
+        app.dependency_overrides[routes.get_generator] = TimingOutGenerator
+        response = client.post("/generate", json={"prompt": "A common English name"})
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+        assert "Deadline exceeded" in response.json()["detail"]
@@ -0,0 +1,160 @@
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.config import ProfilingConfig
+from app.main import app
+from app.profiling import ProfileRecorder
+
+
+def work(value: int) -> int:
+    return sum(range(value))
+
+
+def fail() -> None:
+    raise ValueError("No target name set")
+
+
+def spin(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(100))
+
+
+def collapsed_functions(data: bytes) -> set:
+    """Function names appearing anywhere in a collapsed-stack profile."""
+    names = set()
+    for line in data.decode().splitlines():
+        stack, _ = line.rsplit(" ", 1)
+        names.update(frame.split(" (")[0] for frame in stack.split(";"))
+    return names
+
+
+class TestProfileRecorder:
+    """Tests for capturing and storing profiles."""
+
+    def test_disabled_call_is_not_profiled(self):
+        recorder = ProfileRecorder(ProfilingConfig(sample_rate=0.0))
+
+        assert recorder.call("verify", False, work, 10) == (45, None)
+        assert recorder.list() == []
+
+    def test_enabled_call_returns_profile_id(self):
+        recorder = ProfileRecorder(ProfilingConfig())
+
+        result, profile_id = recorder.call("verify", True, work, 10)
+
+        assert result == 45
+        profile = recorder.get(profile_id)
+        assert profile.route == "verify"
+        assert "work" in collapsed_functions(profile.data)
+
+    def test_other_threads_are_not_profiled(self):
+        recorder = ProfileRecorder(ProfilingConfig())
+        stop = threading.Event()
+        busy = threading.Thread(target=spin, args=(stop,))
+        busy.start()
+        try:
+            _, profile_id = recorder.call("verify", True, work, 1_000_000)
+        finally:
+            stop.set()
+            busy.join()
+
+        functions = collapsed_functions(recorder.get(profile_id).data)
+        assert "work" in functions
+        assert "spin" not in functions
+
+    def test_failed_call_is_not_stored(self):
+        recorder = ProfileRecorder(ProfilingConfig())
+
+        with pytest.raises(ValueError):
+            recorder.call("verify", True, fail)
+        assert recorder.list() == []
+        assert recorder.call("verify", True, work, 10)[1] is not None
+
+    def test_call_is_skipped_while_another_profile_runs(self):
+        recorder = ProfileRecorder(ProfilingConfig())
+
+        with recorder._active:
+            assert recorder.call("verify", True, work, 10) == (45, None)
+        assert recorder.list() == []
+
+    def test_ring_keeps_most_recent_profiles(self):
+        recorder = ProfileRecorder(ProfilingConfig(max_profiles=2))
+        ids = [recorder.call("verify", True, work, 10)[1] for _ in range(3)]
+
+        assert [profile.id for profile in recorder.list()] == [ids[2], ids[1]]
+        assert recorder.get(ids[0]) is None
+
+
+class TestSampleRate:
+    """Tests for configuring the sample rate from the environment."""
+
+    @pytest.mark.parametrize("value, expected", [
+        ("", 0.0),
+        ("0.25", 0.25),
+        ("1", 1.0),
+        ("-0.5", 0.0),
+        ("3", 1.0),
+        ("inf", 1.0)
+    ])
+    def test_sample_rate_is_read_and_clamped(self, monkeypatch, value, expected):
+        monkeypatch.setenv("PROFILE_SAMPLE_RATE", value)
+        assert ProfilingConfig().sample_rate == expected
+
+    def test_sample_rate_defaults_to_off(self, monkeypatch):
+        monkeypatch.delenv("PROFILE_SAMPLE_RATE", raising=False)
+        assert ProfilingConfig().sample_rate == 0.0
+
+    @pytest.mark.parametrize("value", ["often", "nan"])
+    def test_invalid_sample_rate_is_rejected(self, monkeypatch, value):
+        monkeypatch.setenv("PROFILE_SAMPLE_RATE", value)
+        with pytest.raises(ValueError, match="PROFILE_SAMPLE_RATE"):
+            ProfilingConfig()
+
+    def test_full_sample_rate_profiles_every_request(self):
+        recorder = ProfileRecorder(ProfilingConfig(sample_rate=1.0))
+        assert recorder.should_profile(False)
+
+
+class TestProfileRoutes:
+    """Tests for requesting and downloading profiles over HTTP."""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        monkeypatch.setenv("ADMIN_TOKEN", "secret")
+        routes.store_for(None).set_target("William Smith")
+        return TestClient(app)
+
+    def test_profile_id_header_matches_stored_profile(self, client):
+        response = client.post(
+            "/verify",
+            json={"candidate_name": "William Smith"},
+            headers={"X-Profile": "secret"}
+        )
+        profile_id = response.headers["X-Profile-Id"]
+
+        download = client.get(
+            f"/admin/profiles/{profile_id}",
+            headers={"X-Admin-Token": "secret"}
+        )
+        assert download.status_code == 200
+        assert download.headers["Content-Disposition"].endswith(f'verify-{profile_id}.folded"')
+
+    def test_no_profile_id_without_valid_token(self, client):
+        for headers in [{}, {"X-Profile": "wrong"}]:
+            response = client.post(
+                "/verify",
+                json={"candidate_name": "William Smith"},
+                headers=headers
+            )
+            assert response.status_code == 200
+            assert "X-Profile-Id" not in response.headers
+
+    def test_admin_endpoints_require_token(self, client):
+        assert client.get("/admin/profiles").status_code == 403
+        assert client.get(
+            "/admin/profiles",
+            headers={"X-Admin-Token": "wrong"}
+        ).status_code == 403
@@ -0,0 +1,170 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.config import SessionStoreConfig
+from app.main import app
+from app.store.sessions import SessionStore, _ENTRY_OVERHEAD, _TOKEN_OVERHEAD
+from app.store.target_profile import TargetProfile
+
+
+def build_profile(name: str) -> TargetProfile:
+    return TargetProfile(name=name, tokens=tuple(name.split()))
+
+
+# Size of an entry with a one-character session ID and target name:
+# the ID, the name and its single token.
+ENTRY_SIZE = _ENTRY_OVERHEAD + _TOKEN_OVERHEAD + 3
+
+
+def make_store(ttl: float = 60.0, entries: int = 2) -> SessionStore:
+    """Single-stripe store whose budget holds exactly ``entries`` small entries."""
+    config = SessionStoreConfig(stripes=1, ttl=ttl, max_bytes=ENTRY_SIZE * entries)
+    return SessionStore(config, build_profile)
+
+
+class TestSessionStore:
+    """Tests for session-scoped storage."""
+
+    def test_get_missing_session(self):
+        store = make_store()
+        assert store.get_profile("a") is None
+        assert store.session("a").get_target() is None
+
+    def test_sessions_are_isolated(self):
+        store = make_store()
+        store.session("a").set_target("x")
+        store.session("b").set_target("y")
+
+        assert store.session("a").get_target() == "x"
+        assert store.session("b").get_target() == "y"
+
+    def test_profile_is_precomputed(self):
+        store = make_store(entries=4)
+        store.set_target("a", "Ahmed Rashid")
+
+        profile = store.get_profile("a")
+        assert profile.tokens == ("Ahmed", "Rashid")
+        assert store.get_profile("a") is profile
+
+
+class TestEviction:
+    """Tests for TTL and LRU eviction."""
+
+    def test_expired_session_is_dropped_on_read(self):
+        store = make_store(ttl=0.05)
+        store.set_target("a", "x")
+        time.sleep(0.06)
+
+        assert store.get_profile("a") is None
+        assert len(store) == 0
+        assert store._stripes[0].bytes == 0
+
+    def test_read_refreshes_ttl(self):
+        store = make_store(ttl=0.1)
+        store.set_target("a", "x")
+        for _ in range(3):
+            time.sleep(0.05)
+            assert store.get_profile("a") is not None
+
+    def test_expired_sessions_are_evicted_on_write(self):
+        store = make_store(ttl=0.05, entries=4)
+        store.set_target("a", "x")
+        store.set_target("b", "x")
+        time.sleep(0.06)
+        store.set_target("c", "x")
+
+        assert len(store) == 1
+        assert store._stripes[0].bytes == ENTRY_SIZE
+
+    def test_least_recently_used_is_evicted_over_budget(self):
+        store = make_store(entries=2)
+        store.set_target("a", "x")
+        store.set_target("b", "x")
+        store.get_profile("a")
+        store.set_target("c", "x")
+
+        assert store.get_profile("a") is not None
+        assert store.get_profile("b") is None
+        assert store.get_profile("c") is not None
+        assert store._stripes[0].bytes == 2 * ENTRY_SIZE
+
+    def test_overwrite_replaces_byte_count(self):
+        store = make_store(entries=2)
+        store.set_target("b", "x")
+        for name in ["x", "y", "z", "w"]:
+            store.set_target("a", name)
+
+        assert store.get_profile("b") is not None
+        assert len(store) == 2
+        assert store._stripes[0].bytes == 2 * ENTRY_SIZE
+
+    def test_entry_larger_than_budget_is_kept(self):
+        store = make_store(entries=1)
+        store.set_target("a", "x")
+        store.set_target("b", "x" * 1000)
+
+        assert store.get_profile("a") is None
+        assert store.get_profile("b").name == "x" * 1000
+        assert len(store) == 1
+
+    def test_overwrite_with_larger_target_counts_new_size(self):
+        store = make_store(entries=3)
+        store.set_target("a", "x")
+        store.set_target("a", "xyz")
+
+        assert store._stripes[0].bytes == ENTRY_SIZE + 4
+
+
+class TestSessionRouting:
+    """Tests for selecting a store through the X-Session-Id header."""
+
+    @pytest.fixture
+    def client(self):
+        return TestClient(app)
+
+    def test_session_header_selects_session_target(self, client):
+        routes.store_for("alpha").set_target("William Smith")
+        routes.store_for("beta").set_target("Ahmed Al-Rashid")
+
+        alpha = client.post(
+            "/verify",
+            json={"candidate_name": "William Smith"},
+            headers={"X-Session-Id": "alpha"}
+        )
+        beta = client.post(
+            "/verify",
+            json={"candidate_name": "William Smith"},
+            headers={"X-Session-Id": "beta"}
+        )
+
+        assert alpha.status_code == 200
+        assert alpha.json()["match"] is True
+        assert beta.status_code == 200
+        assert beta.json()["match"] is False
+
+    def test_session_target_does_not_touch_shared_store(self):
+        shared = routes.store_for(None)
+        shared.set_target("Robert Jones")
+        routes.store_for("gamma").set_target("James Brown")
+
+        assert shared.get_target() == "Robert Jones"
+        assert routes.store_for("gamma").get_target() == "James Brown"
+
+    def test_unknown_session_has_no_target(self, client):
+        response = client.post(
+            "/verify",
+            json={"candidate_name": "William Smith"},
+            headers={"X-Session-Id": "unknown"}
+        )
+        assert response.status_code == 400
+
+    def test_overlong_session_id_is_rejected(self, client):
+        response = client.post(
+            "/verify",
+            json={"candidate_name": "William Smith"},
+            headers={"X-Session-Id": "s" * 129}
+        )
+        assert response.status_code == 422